@@ -1,6 +1,8 @@
 import os
 import sys
 import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
 import pandas as pd
 import numpy as np
 
@@ -8,8 +10,10 @@ import numpy as np
 PROJECT_ROOT = os.path.dirname(__file__)
 sys.path.append(os.path.join(PROJECT_ROOT, 'Trade-Ai'))
 
-from strategy_loader import discover_strategies
+from strategy_loader import discover_strategies, strategy_name
 from strategy_base import StrategyBase
+from indicators_jit import perf_loop
+from utils._io import read_ohlcv, to_soa, write_series_csv
 
 def annualization_factor(freq: str) -> float:
     """
@@ -30,119 +34,249 @@ def compute_performance(df: pd.DataFrame,
     """
     Takes a DataFrame with signal and closing price columns.
     Returns a dict with performance metrics and the equity series.
+    The DataFrame itself is not modified.
     """
-    # 1) Calculate period returns of the price
-    df['price_ret'] = df[price_col].pct_change().fillna(0)
+    close = df[price_col].to_numpy(dtype=np.float64)
+    sig = df[signal_col].to_numpy(dtype=np.float64)
+    return compute_performance_arrays(close, sig, df.index, capital)
 
-    # 2) Strategy return: previous signal * price return
-    df['strat_ret'] = df[signal_col].shift(1).fillna(0) * df['price_ret']
-
-    # 3) Cumulative equity curve
-    df['equity'] = (1 + df['strat_ret']).cumprod() * capital
+def compute_performance_arrays(close: np.ndarray,
+                               sig: np.ndarray,
+                               index: pd.Index,
+                               capital: float = 1.0) -> dict:
+    """
+    Same as compute_performance, but on plain float64 close/signal arrays
+    aligned with `index`, so callers need not build a DataFrame.
+    """
+    # 1) Strategy returns (previous signal * price return), equity curve,
+    #    return mean/std and max drawdown in a single pass over plain arrays
+    equity, strat_ret, mean_ret, std_ret, max_dd = perf_loop(close, sig, float(capital))
 
-    # 4) Metrics
-    total_ret = df['equity'].iloc[-1] / capital - 1
-    mean_ret = df['strat_ret'].mean()
-    std_ret  = df['strat_ret'].std()
+    # 2) Metrics
+    total_ret = equity[-1] / capital - 1
 
-    # Determine data frequency and annualize
-    freq = pd.infer_freq(df.index) or 'D'
+    # Determine data frequency and annualize. Stamps with mixed offsets
+    # (intraday data across DST) form an object index: use their UTC instants
+    if index.dtype == object:
+        index_utc = pd.to_datetime(index, utc=True)
+    else:
+        index_utc = index
+    freq = pd.infer_freq(index_utc) or 'D'
     ann_factor = annualization_factor(freq)
 
     ann_ret = (1 + mean_ret) ** ann_factor - 1
     ann_vol = std_ret * np.sqrt(ann_factor)
     sharpe  = (mean_ret / std_ret) * np.sqrt(ann_factor) if std_ret != 0 else np.nan
 
-    # Maximum drawdown
-    running_max = df['equity'].cummax()
-    drawdown = df['equity'] / running_max - 1
-    max_dd = drawdown.min()
-
     return {
         'total_return': total_ret,
         'annual_return': ann_ret,
         'annual_volatility': ann_vol,
         'sharpe_ratio': sharpe,
         'max_drawdown': max_dd,
-        'equity_series': df['equity'],
-        'returns_series': df['strat_ret']
+        'equity_series': pd.Series(equity, index=index, name='equity', copy=False),
+        'returns_series': pd.Series(strat_ret, index=index, name='strat_ret', copy=False)
     }
 
+def parse_params(pairs) -> dict:
+    """
+    Turns ['fast=10', 'slow=50'] into {'fast': 10, 'slow': 50},
+    trying int, then float, then falling back to str.
+    """
+    init_args = {}
+    for kv in pairs:
+        if '=' not in kv:
+            continue
+        k, v = kv.split('=', 1)
+        init_args[k] = _parse_value(v)
+    return init_args
+
+def _parse_value(v: str):
+    try:
+        return int(v)
+    except ValueError:
+        try:
+            return float(v)
+        except ValueError:
+            return v
+
+def parse_grid(pairs) -> dict:
+    """
+    Turns ['fast=5,10', 'slow=50,100'] into {'fast': [5, 10], 'slow': [50, 100]}.
+    """
+    grid = {}
+    for kv in pairs:
+        if '=' not in kv:
+            continue
+        k, v = kv.split('=', 1)
+        grid[k] = [_parse_value(x) for x in v.split(',') if x]
+    return grid
+
+def load_data(path: str) -> pd.DataFrame:
+    return read_ohlcv(path)
+
+def find_strategy(strat_classes, name: str):
+    for cls in strat_classes:
+        if strategy_name(cls) == name:
+            return cls
+    return None
+
+def run_one(df: pd.DataFrame, strat_cls, params: dict, capital: float = 1.0,
+            ohlcv: dict = None) -> dict:
+    """
+    Instantiates `strat_cls` with `params`, generates signals on `df`
+    and returns the performance dict from compute_performance_arrays.
+    `ohlcv` is the optional SoA array view of df (see utils._io.to_soa).
+    The caller's DataFrame is neither modified nor copied.
+    """
+    strat: StrategyBase = strat_cls(**params)
+    signals = strat.generate_signals(df, ohlcv)
+    if ohlcv is not None:
+        close = ohlcv['Close']
+    else:
+        close = df['Close'].to_numpy(dtype=np.float64)
+    sig = signals.to_numpy(dtype=np.float64)
+    perf = compute_performance_arrays(close, sig, df.index, capital)
+    perf['strategy'] = strat.get_name()
+    perf['params'] = strat.get_params()
+    return perf
+
+# Per-worker state for run_grid. Under fork the DataFrame passed through
+# initargs is inherited copy-on-write; under spawn it is pickled once per worker.
+_GRID_DF = None
+_GRID_OHLCV = None
+_GRID_CLASSES = None
+
+def _init_grid_worker(df: pd.DataFrame, strat_dir: str):
+    global _GRID_DF, _GRID_OHLCV, _GRID_CLASSES
+    _GRID_DF = df
+    _GRID_OHLCV = to_soa(df)
+    _GRID_CLASSES = {strategy_name(cls): cls for cls in discover_strategies(strat_dir)}
+
+def _run_grid_task(name: str, params: dict, capital: float) -> dict:
+    perf = run_one(_GRID_DF, _GRID_CLASSES[name], params, capital, _GRID_OHLCV)
+    # Series stay in the worker; only the scalar metrics travel back
+    perf.pop('equity_series')
+    perf.pop('returns_series')
+    return perf
+
+def run_grid(data_path: str,
+             param_grid: dict,
+             strategy: str = None,
+             capital: float = 1.0,
+             output: str = 'grid_results.csv',
+             max_workers: int = None) -> pd.DataFrame:
+    """
+    Backtests every discovered strategy (or only `strategy`) over the
+    cartesian product of `param_grid`, one process-pool task per combo.
+    Only the parameters a strategy's __init__ accepts are applied to it.
+    Results are written to `output` as CSV and returned as a DataFrame.
+    """
+    df = load_data(data_path)
+    strat_dir = os.path.join(PROJECT_ROOT, 'strategies')
+    strat_classes = discover_strategies(strat_dir)
+
+    tasks = []
+    for cls in strat_classes:
+        name = strategy_name(cls)
+        if strategy is not None and name != strategy:
+            continue
+        keys = [k for k in param_grid if k in cls.__init__.__code__.co_varnames]
+        values = [param_grid[k] for k in keys]
+        for combo in product(*values):
+            tasks.append((name, dict(zip(keys, combo))))
+
+    results = []
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(),
+                             initializer=_init_grid_worker,
+                             initargs=(df, strat_dir)) as ex:
+        futures = [ex.submit(_run_grid_task, name, params, capital) for name, params in tasks]
+        for fut in as_completed(futures):
+            perf = fut.result()
+            row = {'strategy': perf.pop('strategy')}
+            row.update(perf.pop('params'))
+            row.update(perf)
+            results.append(row)
+
+    res_df = pd.DataFrame(results)
+    if not res_df.empty:
+        res_df = res_df.sort_values('sharpe_ratio', ascending=False)
+    output_dir = os.path.dirname(output)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir, exist_ok=True)
+    res_df.to_csv(output, index=False)
+    return res_df
+
 def main():
     parser = argparse.ArgumentParser(
-        description="Backtest a single strategy on an OHLCV+features CSV"
+        description="Backtest a single strategy on an OHLCV+features CSV or Parquet file"
     )
     parser.add_argument('-d', '--data', required=True,
-                        help="CSV file with date index and OHLCV plus feature columns")
-    parser.add_argument('-s', '--strategy', required=True,
-                        help="Strategy key (get_name()), e.g.: ma_crossover")
+                        help="CSV or Parquet file with date index and OHLCV plus feature columns")
+    parser.add_argument('-s', '--strategy',
+                        help="Strategy key (get_name()), e.g.: ma_crossover. "
+                             "Required unless --grid is given")
     parser.add_argument('-p', '--params', nargs='*', default=[],
                         help="Strategy parameters as key=value pairs, e.g. fast=10 slow=50")
+    parser.add_argument('-g', '--grid', nargs='*', default=None,
+                        help="Run a parallel grid search instead of a single backtest; "
+                             "values as key=v1,v2,... pairs, e.g. fast=5,10 slow=50,100")
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help="Worker processes for --grid (default: CPU count)")
     parser.add_argument('-c', '--capital', type=float, default=1.0,
                         help="Starting capital (default: 1.0)")
-    parser.add_argument('-o', '--output', default='equity.csv',
-                        help="Path to save the equity curve CSV")
+    parser.add_argument('-o', '--output', default=None,
+                        help="Path to save the equity curve CSV "
+                             "(default: equity.csv, or grid_results.csv with --grid)")
     args = parser.parse_args()
 
+    if args.grid is not None:
+        output = args.output or 'grid_results.csv'
+        res_df = run_grid(args.data, parse_grid(args.grid), strategy=args.strategy,
+                          capital=args.capital, output=output, max_workers=args.workers)
+        print(f"\n=== Grid search: {len(res_df)} runs ===\n")
+        if not res_df.empty:
+            print(res_df.head(10).to_string(index=False))
+        print("\nResults saved to:", output)
+        return
+
+    if args.strategy is None:
+        parser.error("the following arguments are required: -s/--strategy")
+    output = args.output or 'equity.csv'
+
     # 1) Load the data
-    df = pd.read_csv(args.data, index_col=0, parse_dates=True, infer_datetime_format=True)
-    df = df.sort_index()
+    df = load_data(args.data)
+    ohlcv = to_soa(df)
 
     # 2) Discover the strategy class
     strat_dir = os.path.join(PROJECT_ROOT, 'strategies')
     strat_classes = discover_strategies(strat_dir)
-    strat_cls = None
-    for cls in strat_classes:
-        inst = cls()  # instantiate without params to check its name
-        if inst.get_name() == args.strategy:
-            strat_cls = cls
-            break
+    strat_cls = find_strategy(strat_classes, args.strategy)
     if strat_cls is None:
         print(f"❌ Strategy '{args.strategy}' not found in strategies/")
-        print("Available strategies:", [cls().get_name() for cls in strat_classes])
+        print("Available strategies:", [strategy_name(cls) for cls in strat_classes])
         sys.exit(1)
 
     # 3) Parse parameters
-    init_args = {}
-    for kv in args.params:
-        if '=' not in kv:
-            continue
-        k, v = kv.split('=', 1)
-        try:
-            init_args[k] = int(v)
-        except ValueError:
-            try:
-                init_args[k] = float(v)
-            except ValueError:
-                init_args[k] = v
-
-    # 4) Instantiate the strategy
-    strat: StrategyBase = strat_cls(**init_args)
-
-    # 5) Generate signals
-    signals = strat.generate_signals(df)
-    df['signal'] = signals
+    init_args = parse_params(args.params)
 
-    # 6) Run backtest
-    perf = compute_performance(df, signal_col='signal', price_col='Close', capital=args.capital)
+    # 4-6) Instantiate, generate signals and run the backtest
+    perf = run_one(df, strat_cls, init_args, capital=args.capital, ohlcv=ohlcv)
 
     # 7) Print results
-    print("\n=== Backtest results for strategy:", strat.get_name(), "===\n")
+    print("\n=== Backtest results for strategy:", perf['strategy'], "===\n")
     print(f"Total return:       {perf['total_return'] * 100:.2f}%")
     print(f"Annualized return:  {perf['annual_return'] * 100:.2f}%")
     print(f"Annual volatility:  {perf['annual_volatility'] * 100:.2f}%")
     print(f"Sharpe ratio:       {perf['sharpe_ratio']:.2f}")
     print(f"Max drawdown:       {perf['max_drawdown'] * 100:.2f}%")
-    print("\nEquity curve saved to:", args.output)
+    print("\nEquity curve saved to:", output)
 
     # 8) Save the equity curve
-    out_df = pd.DataFrame({
-        'equity': perf['equity_series']
-    })
-    output_dir = os.path.dirname(args.output)
+    output_dir = os.path.dirname(output)
     if output_dir and not os.path.exists(output_dir):
         os.makedirs(output_dir, exist_ok=True)
-    out_df.to_csv(args.output)
+    write_series_csv(perf['equity_series'], output, name='equity')
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,102 +1,138 @@
 import os
+import sys
 import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import pandas as pd
 import numpy as np
 
-def compute_rsi(close: pd.Series, period: int = 14) -> pd.Series:
-    delta = close.diff()
-    gain = delta.clip(lower=0)
-    loss = -delta.clip(upper=0)
-    avg_gain = gain.ewm(alpha=1/period, min_periods=period).mean()
-    avg_loss = loss.ewm(alpha=1/period, min_periods=period).mean()
-    rs = avg_gain / avg_loss
-    return 100 - (100 / (1 + rs))
+from indicators_jit import rsi_loop, macd_loop, bollinger_loop, obv_loop
+from utils._io import FEATURES_EXT, read_ohlcv, to_soa, write_frame
 
-def compute_macd(close: pd.Series,
+try:
+    from tqdm import tqdm
+except ImportError:
+    def tqdm(iterable, **kwargs):
+        return iterable
+
+def _values(x) -> np.ndarray:
+    # Series или уже готовый SoA-массив → непрерывный float64
+    if isinstance(x, pd.Series):
+        return x.to_numpy(dtype=np.float64)
+    return np.ascontiguousarray(x, dtype=np.float64)
+
+def _wrap(arr: np.ndarray, like):
+    # Для Series возвращаем Series с тем же индексом, для массивов — массив
+    if isinstance(like, (pd.Series, pd.DataFrame)):
+        return pd.Series(arr, index=like.index)
+    return arr
+
+def compute_rsi(close, period: int = 14):
+    return _wrap(rsi_loop(_values(close), period), close)
+
+def compute_macd(close,
                  fast: int = 12,
                  slow: int = 26,
                  signal: int = 9):
-    ema_fast    = close.ewm(span=fast, adjust=False).mean()
-    ema_slow    = close.ewm(span=slow, adjust=False).mean()
-    macd_line   = ema_fast - ema_slow
-    macd_signal = macd_line.ewm(span=signal, adjust=False).mean()
-    macd_hist   = macd_line - macd_signal
+    line, sig, hist = macd_loop(_values(close), 2 / (fast + 1), 2 / (slow + 1), 2 / (signal + 1))
+    macd_line   = _wrap(line, close)
+    macd_signal = _wrap(sig, close)
+    macd_hist   = _wrap(hist, close)
     return macd_line, macd_signal, macd_hist
 
-def compute_bollinger(close: pd.Series,
+def compute_bollinger(close,
                       period: int = 20,
                       std_factor: int = 2):
-    sma   = close.rolling(window=period).mean()
-    std   = close.rolling(window=period).std()
-    upper = sma + std_factor * std
-    lower = sma - std_factor * std
+    sma, upper, lower = bollinger_loop(_values(close), period, float(std_factor))
+    sma   = _wrap(sma, close)
+    upper = _wrap(upper, close)
+    lower = _wrap(lower, close)
     return sma, upper, lower
 
-def compute_obv(df: pd.DataFrame) -> pd.Series:
-    direction = np.sign(df['Close'].diff()).fillna(0)
-    return (direction * df['Volume']).cumsum()
+def compute_obv(df) -> pd.Series:
+    """
+    `df` — DataFrame либо SoA-словарь из to_soa (тогда возвращается массив).
+    """
+    c = _values(df['Close'])
+    v = _values(df['Volume'])
+    return _wrap(obv_loop(c, v), df)
 
 def process_file(input_path: str, output_path: str):
-    # 1) Загрузка и разбор дат
-    df = pd.read_csv(
-        input_path,
-        index_col=0,
-        parse_dates=True,
-        infer_datetime_format=True
-    )
-    df = df.sort_index()
+    # 1) Загрузка и разбор дат (CSV: OHLCV сразу приводятся к float64;
+    #    Parquet: типы уже сохранены в файле)
+    df = read_ohlcv(input_path)
 
-    # 2) Приводим колонки к числовому типу (строки → float/int)
-    for col in ['Open', 'High', 'Low', 'Close', 'Volume']:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
-
-    # 3) Убираем строки с NaN в базовых колонках
+    # 2) Убираем строки с NaN в базовых колонках
     df.dropna(subset=['Open', 'High', 'Low', 'Close', 'Volume'], inplace=True)
 
-    # 4) Расчёт индикаторов
-    df['rsi_14'] = compute_rsi(df['Close'], period=14)
+    # 3) Расчёт индикаторов: обёртки принимают непрерывные
+    #    float64-массивы (SoA) и возвращают массивы, без промежуточных Series
+    ohlcv = to_soa(df)
+    close = ohlcv['Close']
+
+    df['rsi_14'] = compute_rsi(close, period=14)
 
-    macd_line, macd_signal, macd_hist = compute_macd(df['Close'])
+    macd_line, macd_signal, macd_hist = compute_macd(close)
     df['macd_line']   = macd_line
     df['macd_signal'] = macd_signal
     df['macd_hist']   = macd_hist
 
-    sma, upper, lower = compute_bollinger(df['Close'], period=20, std_factor=2)
+    sma, upper, lower = compute_bollinger(close, period=20, std_factor=2)
     df['bb_sma_20']   = sma
     df['bb_upper_20'] = upper
     df['bb_lower_20'] = lower
 
-    df['obv'] = compute_obv(df)
+    df['obv'] = compute_obv(ohlcv)
 
-    # 5) Удаляем начальные строки с NaN от индикаторов
+    # 4) Удаляем начальные строки с NaN от индикаторов
     df.dropna(inplace=True)
 
-    # 6) Сохраняем результат
+    # 5) Сохраняем результат (Parquet или CSV — по расширению)
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    df.to_csv(output_path)
+    write_frame(df, output_path)
     print(f"✔ Processed {os.path.basename(input_path)} → {os.path.basename(output_path)}")
 
 def main():
     parser = argparse.ArgumentParser(
-        description="Compute technical indicators for OHLCV CSV files"
+        description="Compute technical indicators for OHLCV CSV/Parquet files"
     )
     parser.add_argument(
         '-i', '--input-dir', required=True,
-        help="Папка с исходными CSV (каждый с колонками Open,High,Low,Close,Volume)"
+        help="Папка с исходными CSV/Parquet (каждый с колонками Open,High,Low,Close,Volume)"
     )
     parser.add_argument(
         '-o', '--output-dir', default='features',
-        help="Папка для сохранения CSV с добавленными признаками"
+        help="Папка для сохранения файлов с добавленными признаками "
+             "(Parquet, либо CSV если pyarrow не установлен)"
+    )
+    parser.add_argument(
+        '-w', '--workers', type=int, default=None,
+        help="Количество процессов (по умолчанию: число CPU)"
     )
     args = parser.parse_args()
 
+    in_paths, out_paths = [], []
     for fname in os.listdir(args.input_dir):
-        if not fname.lower().endswith('.csv'):
+        base, ext = os.path.splitext(fname)
+        if ext.lower() not in ('.csv', '.parquet'):
             continue
-        in_path   = os.path.join(args.input_dir, fname)
-        out_fname = fname.replace('.csv', '_features.csv')
-        out_path  = os.path.join(args.output_dir, out_fname)
-        process_file(in_path, out_path)
+        out_fname = base + '_features' + FEATURES_EXT
+        in_paths.append(os.path.join(args.input_dir, fname))
+        out_paths.append(os.path.join(args.output_dir, out_fname))
+
+    # Файлы независимы — обрабатываем их параллельно по процессам
+    failed = []
+    with ProcessPoolExecutor(max_workers=args.workers or os.cpu_count()) as ex:
+        futures = {ex.submit(process_file, i, o): i for i, o in zip(in_paths, out_paths)}
+        for fut in tqdm(as_completed(futures), total=len(futures), desc="Files"):
+            try:
+                fut.result()
+            except Exception as e:
+                failed.append(futures[fut])
+                print(f"‼ Error processing {os.path.basename(futures[fut])}: {e}")
+
+    # Частичный сбой должен быть виден вызывающему скрипту по коду выхода
+    if failed:
+        sys.exit(f"‼ {len(failed)} of {len(futures)} files failed")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
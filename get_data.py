@@ -1,5 +1,7 @@
 import os
+import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import pandas as pd
 import yfinance as yf
@@ -18,40 +20,78 @@ INTERVALS = {
     '1wk': '1wk'
 }
 
-def fetch_interval_chunks(ticker: str, interval_key: str, start: datetime, end: datetime) -> pd.DataFrame:
-    max_delta = MAX_LOOKBACK[interval_key]
-    yf_interval = INTERVALS[interval_key]
+# Parallel chunk downloads and retry policy
+MAX_WORKERS = 8
+RETRIES = 3
+RETRY_BACKOFF = 1.0
 
-    if max_delta is None:
-        return yf.download(
-            tickers=ticker,
-            start=start.strftime("%Y-%m-%d"),
-            end=end.strftime("%Y-%m-%d"),
-            interval=yf_interval,
-            auto_adjust=True,
-            progress=False
-        )
-
-    dfs = []
-    window_start = start
-    while window_start < end:
-        window_end = min(window_start + max_delta, end)
-        print(f"  Downloading {ticker} {interval_key}: {window_start.date()} → {window_end.date()}")
+def download_window(ticker: str, interval_key: str, yf_interval: str,
+                    window_start: datetime, window_end: datetime,
+                    retries: int = RETRIES, backoff: float = RETRY_BACKOFF):
+    """
+    Downloads a single window, retrying with exponential backoff on
+    errors. An empty result is retried once, straight away: windows older
+    than Yahoo's intraday limit (60d for 15m, 730d for 1h) are always
+    empty and are skipped. Returns None if no data was obtained.
+
+    Uses Ticker.history rather than yf.download: download() keeps its
+    results in module-global dicts and is not safe to call from
+    several threads at once. actions=False leaves out the Dividends /
+    Stock Splits columns, so the file holds plain OHLCV.
+    """
+    print(f"  Downloading {ticker} {interval_key}: {window_start.date()} → {window_end.date()}")
+    error = None
+    retried_empty = False
+    for attempt in range(retries + 1):
         try:
-            df_chunk = yf.download(
-                tickers=ticker,
+            df_chunk = yf.Ticker(ticker).history(
                 start=window_start.strftime("%Y-%m-%d"),
                 end=window_end.strftime("%Y-%m-%d"),
                 interval=yf_interval,
                 auto_adjust=True,
-                progress=False
+                actions=False
             )
-            if not df_chunk.empty:
-                dfs.append(df_chunk)
         except Exception as e:
-            print(f"   ‼ Error: {window_start.date()}–{window_end.date()}: {e}")
+            error = e
+        else:
+            if not df_chunk.empty:
+                return df_chunk
+            if retried_empty:
+                return None
+            retried_empty = True
+            continue
+        if attempt < retries:
+            time.sleep(backoff * 2 ** attempt)
+
+    if error is not None:
+        print(f"   ‼ Error: {window_start.date()}–{window_end.date()}: {error}")
+    return None
+
+def fetch_interval_chunks(ticker: str, interval_key: str, start: datetime, end: datetime) -> pd.DataFrame:
+    max_delta = MAX_LOOKBACK[interval_key]
+    yf_interval = INTERVALS[interval_key]
+
+    # No lookback limit: the whole range is a single window. Same call as
+    # the chunked branch, so every interval is saved with the same columns
+    if max_delta is None:
+        df = download_window(ticker, interval_key, yf_interval, start, end)
+        return df if df is not None else pd.DataFrame()
+
+    windows = []
+    window_start = start
+    while window_start < end:
+        window_end = min(window_start + max_delta, end)
+        windows.append((window_start, window_end))
         window_start = window_end
 
+    # Network-bound: download the windows concurrently; map() keeps their order
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        chunks = list(ex.map(
+            lambda w: download_window(ticker, interval_key, yf_interval, w[0], w[1]),
+            windows
+        ))
+    dfs = [df_chunk for df_chunk in chunks if df_chunk is not None]
+
     if not dfs:
         return pd.DataFrame()
 
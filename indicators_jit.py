@@ -0,0 +1,291 @@
+"""
+Numba kernels behind the indicators, strategies and backtest metrics.
+
+Every kernel is declared with an explicit signature, so Numba compiles it
+when this module is imported instead of on the first call, and
+`cache=True` stores the machine code in __pycache__: after the first run
+a short CLI invocation only loads it from disk. Inputs are float64
+arrays (see utils._io.to_soa); indicator outputs use FEATURE_DTYPE.
+
+Without Numba the same functions run as plain Python (see utils._njit).
+"""
+
+import numpy as np
+
+from utils._njit import njit
+
+# Input arrays are typed read-only: writable arrays still match, and so do
+# the read-only views pandas hands out under Copy-on-Write (the default
+# from pandas 3), which a plain f8[:] signature would reject.
+F8_RO = "Array(float64, 1, 'A', readonly=True)"
+
+# Indicator outputs are stored in float32: plenty for features/signals and
+# half the memory and bandwidth of float64. The kernels still accumulate
+# their running state in float64; OHLCV columns are left untouched.
+FEATURE_DTYPE = np.float32
+
+# --- Indicators ---
+
+@njit(f'f4[:]({F8_RO}, i8)', cache=True)
+def rsi_loop(c: np.ndarray, n: int) -> np.ndarray:
+    """
+    Wilder's RSI in a single pass: the first `n` deltas seed the average
+    gain/loss with a simple mean, then the recursive smoothing takes over.
+    """
+    out = np.empty(len(c), dtype=FEATURE_DTYPE)
+    out[:] = np.nan
+    if len(c) <= n:
+        return out
+
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, n + 1):
+        d = c[i] - c[i - 1]
+        if d > 0:
+            avg_gain += d
+        elif d < 0:
+            avg_loss -= d
+    avg_gain /= n
+    avg_loss /= n
+
+    for i in range(n, len(c)):
+        if i > n:
+            d = c[i] - c[i - 1]
+            g = d if d > 0 else 0.0
+            l = -d if d < 0 else 0.0
+            avg_gain = (avg_gain * (n - 1) + g) / n
+            avg_loss = (avg_loss * (n - 1) + l) / n
+        if avg_loss == 0.0:
+            out[i] = 100.0 if avg_gain > 0.0 else np.nan
+        else:
+            out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    return out
+
+@njit(f'UniTuple(f4[:], 3)({F8_RO}, f8, f8, f8)', cache=True, fastmath=True)
+def macd_loop(c: np.ndarray, af: float, as_: float, asig: float):
+    """
+    Fast EMA, slow EMA and signal EMA updated together in one pass
+    (same recursion as `ewm(span=..., adjust=False)`).
+    """
+    n = len(c)
+    out_line = np.empty(n, dtype=FEATURE_DTYPE)
+    out_sig  = np.empty(n, dtype=FEATURE_DTYPE)
+    out_hist = np.empty(n, dtype=FEATURE_DTYPE)
+    if n == 0:
+        return out_line, out_sig, out_hist
+
+    ef = es = c[0]
+    esig = 0.0
+    for i in range(n):
+        ef += af * (c[i] - ef)
+        es += as_ * (c[i] - es)
+        line = ef - es
+        esig += asig * (line - esig)
+        out_line[i] = line
+        out_sig[i]  = esig
+        out_hist[i] = line - esig
+    return out_line, out_sig, out_hist
+
+@njit(f'UniTuple(f4[:], 3)({F8_RO}, i8, f8)', cache=True)
+def bollinger_loop(c: np.ndarray, n: int, k: float):
+    """
+    Rolling mean and sample std over a window of `n` using running
+    sum / sum-of-squares: each step adds the entering value and drops
+    the leaving one, so the whole series is covered in O(len(c)).
+    NaNs are kept out of the sums and counted instead; a window holding
+    any NaN yields NaN, like `rolling(n)`.
+    """
+    size = len(c)
+    out_sma = np.empty(size, dtype=FEATURE_DTYPE)
+    out_up  = np.empty(size, dtype=FEATURE_DTYPE)
+    out_lo  = np.empty(size, dtype=FEATURE_DTYPE)
+    out_sma[:] = np.nan
+    out_up[:]  = np.nan
+    out_lo[:]  = np.nan
+    if n < 2 or size < n:
+        return out_sma, out_up, out_lo
+
+    s = 0.0
+    s2 = 0.0
+    nans = 0
+    for i in range(size):
+        x = c[i]
+        if np.isnan(x):
+            nans += 1
+        else:
+            s += x
+            s2 += x * x
+        if i >= n:
+            x = c[i - n]
+            if np.isnan(x):
+                nans -= 1
+            else:
+                s -= x
+                s2 -= x * x
+        if i < n - 1 or nans > 0:
+            continue
+
+        mean = s / n
+        var = (s2 - s * s / n) / (n - 1)
+        # Cancellation in the running sums can push a flat window just below zero
+        sd = np.sqrt(var) if var > 0.0 else 0.0
+        out_sma[i] = mean
+        out_up[i]  = mean + k * sd
+        out_lo[i]  = mean - k * sd
+    return out_sma, out_up, out_lo
+
+@njit(f'f4[:]({F8_RO}, {F8_RO})', cache=True)
+def obv_loop(c: np.ndarray, v: np.ndarray) -> np.ndarray:
+    out = np.empty(len(c), dtype=FEATURE_DTYPE)
+    if len(c) == 0:
+        return out
+    acc = 0.0
+    out[0] = 0.0
+    for i in range(1, len(c)):
+        d = c[i] - c[i - 1]
+        if d > 0:
+            acc += v[i]
+        elif d < 0:
+            acc -= v[i]
+        out[i] = acc
+    return out
+
+# --- Strategies ---
+
+@njit('UniTuple(f8, 2)(f8, f8, f8)', cache=True)
+def _kahan_add(total: float, comp: float, x: float):
+    """
+    Kahan-compensated `total + x`; returns the new (total, compensation).
+    """
+    y = x - comp
+    t = total + y
+    return t, (t - total) - y
+
+@njit('f8(f8, i8, i8, i8, f8)', cache=True)
+def _window_mean(total: float, nobs: int, neg: int, run: int, last: float) -> float:
+    """
+    Mean of a full window the way pandas' roll_mean finishes it: a window
+    made of one repeated value is that value exactly, and the sign cannot
+    flip through rounding in the sum.
+    """
+    if run >= nobs:
+        return last
+    mean = total / nobs
+    if neg == 0 and mean < 0.0:
+        return 0.0
+    if neg == nobs and mean > 0.0:
+        return 0.0
+    return mean
+
+@njit(f'i1[:]({F8_RO}, i8, i8)', cache=True)
+def dual_ma_signals(c: np.ndarray, f: int, s: int) -> np.ndarray:
+    """
+    Walks `c` once, keeping running window sums for the fast and slow
+    MAs, and emits +1/-1 on the bar where the fast MA crosses the slow one.
+
+    The only per-bar memory is an int8 state: +1 while the fast MA is
+    above the slow one, -1 while below, 0 when equal or still warming up.
+    A crossing is any change away from a non-zero state, and its signal
+    is the opposite of that state.
+
+    The sums follow pandas' roll_mean step for step (drop the leaving
+    value, then add the entering one, each with its own Kahan
+    compensation, and track the run of identical values), so both MAs
+    are bit-identical to `rolling().mean()` and equal MAs on flat prices
+    compare equal. NaNs are left out of the sums; while either window
+    holds one the MAs are undefined: no signal, and the state resets to 0.
+    """
+    n = len(c)
+    signals = np.zeros(n, dtype=np.int8)
+    sum_f = add_f = rem_f = 0.0
+    sum_s = add_s = rem_s = 0.0
+    nobs_f = nobs_s = 0
+    neg_f = neg_s = 0
+    # Length of the current run of identical non-NaN values, shared by
+    # both windows since they see the same values in the same order
+    run = 0
+    last = c[0] if n > 0 else np.nan
+    state = 0
+    for i in range(n):
+        if i >= f:
+            x = c[i - f]
+            if not np.isnan(x):
+                nobs_f -= 1
+                sum_f, rem_f = _kahan_add(sum_f, rem_f, -x)
+                if np.signbit(x):
+                    neg_f -= 1
+        if i >= s:
+            x = c[i - s]
+            if not np.isnan(x):
+                nobs_s -= 1
+                sum_s, rem_s = _kahan_add(sum_s, rem_s, -x)
+                if np.signbit(x):
+                    neg_s -= 1
+
+        x = c[i]
+        if not np.isnan(x):
+            nobs_f += 1
+            nobs_s += 1
+            sum_f, add_f = _kahan_add(sum_f, add_f, x)
+            sum_s, add_s = _kahan_add(sum_s, add_s, x)
+            if np.signbit(x):
+                neg_f += 1
+                neg_s += 1
+            run = run + 1 if x == last else 1
+            last = x
+
+        if nobs_f < f or nobs_s < s:
+            state = 0
+            continue
+
+        ma_f = _window_mean(sum_f, nobs_f, neg_f, run, last)
+        ma_s = _window_mean(sum_s, nobs_s, neg_s, run, last)
+        new_state = 1 if ma_f > ma_s else (-1 if ma_f < ma_s else 0)
+        if new_state != state:
+            signals[i] = -state
+        state = new_state
+    return signals
+
+# --- Backtest ---
+
+@njit(f'Tuple((f8[:], f8[:], f8, f8, f8))({F8_RO}, {F8_RO}, f8)', cache=True)
+def perf_loop(close: np.ndarray, sig: np.ndarray, capital: float):
+    """
+    One pass over close/signal: strategy returns, equity curve, running
+    mean/std of the returns (Welford) and maximum drawdown.
+    """
+    n = len(close)
+    eq = np.empty(n)
+    sret = np.empty(n)
+    if n == 0:
+        return eq, sret, np.nan, np.nan, np.nan
+
+    eq[0] = capital
+    sret[0] = 0.0
+    cmax = capital
+    maxdd = 0.0
+    # Welford state after bar 0: its zero return is part of the sample,
+    # as with Series.mean()/std()
+    mean = 0.0
+    m2 = 0.0
+    for i in range(1, n):
+        r = close[i] / close[i - 1] - 1.0
+        if np.isnan(r):
+            r = 0.0
+        prev_sig = sig[i - 1]
+        if np.isnan(prev_sig):
+            prev_sig = 0.0
+        sr = prev_sig * r
+        sret[i] = sr
+        delta = sr - mean
+        mean += delta / (i + 1)
+        m2 += delta * (sr - mean)
+        eq[i] = eq[i - 1] * (1.0 + sr)
+        if eq[i] > cmax:
+            cmax = eq[i]
+        dd = eq[i] / cmax - 1.0
+        if dd < maxdd:
+            maxdd = dd
+
+    std = np.sqrt(m2 / (n - 1)) if n > 1 else np.nan
+    return eq, sret, mean, std, maxdd
@@ -1,11 +1,35 @@
-from abc import ABC, abstractmethod
+from abc import abstractmethod
 import pandas as pd
 
-class StrategyBase(ABC):
+class StrategyBase:
     """
     Base interface for any trading strategy.
+
+    Not an ABC: the abstract methods are checked once, when a subclass
+    is defined (see __init_subclass__), so instantiation carries no
+    metaclass overhead. Subclasses should declare __slots__ for their
+    parameters to avoid a per-instance __dict__.
     """
 
+    __slots__ = ()
+
+    # Optional static strategy key. When set, the loader reads it
+    # instead of instantiating the class just to call get_name().
+    NAME: str = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Same bookkeeping as ABCMeta: a class that still has abstract methods
+        # (e.g. an intermediate base declaring its own) can be defined but
+        # not instantiated
+        abstracts = {name for name, value in vars(cls).items()
+                     if getattr(value, '__isabstractmethod__', False)}
+        for base in cls.__bases__:
+            for name in getattr(base, '__abstractmethods__', ()):
+                if getattr(getattr(cls, name, None), '__isabstractmethod__', False):
+                    abstracts.add(name)
+        cls.__abstractmethods__ = frozenset(abstracts)
+
     @abstractmethod
     def __init__(self, **params):
         """
@@ -14,11 +38,15 @@ class StrategyBase(ABC):
         ...
 
     @abstractmethod
-    def generate_signals(self, df: pd.DataFrame) -> pd.Series:
+    def generate_signals(self, df: pd.DataFrame, ohlcv: dict = None) -> pd.Series:
         """
         Takes as input a DataFrame with OHLCV data and
         returns a pd.Series of {-1, 0, +1} ('sell', 'hold', 'buy')
         with the same index as df.
+
+        `ohlcv`, when given, holds the same OHLCV columns as C-contiguous
+        float64 arrays (see utils._io.to_soa); array-based strategies
+        should read from it instead of converting df columns themselves.
         """
         ...
 
@@ -34,4 +62,8 @@ class StrategyBase(ABC):
         """
         Returns the current strategy parameters for logging/GA.
         """
-        ...
\ No newline at end of file
+        ...
+
+StrategyBase.__abstractmethods__ = frozenset(
+    ('__init__', 'generate_signals', 'get_name', 'get_params')
+)
@@ -1,26 +1,68 @@
 import os
+import sys
 import importlib
+import inspect
+import pkgutil
+from functools import lru_cache
 from typing import List, Type
 from strategy_base import StrategyBase
 
 def discover_strategies(path: str) -> List[Type[StrategyBase]]:
     """
-    Scans the directory at `path`, finds Python modules with classes
-    inheriting from StrategyBase, and returns a list of those classes.
+    Scans the package directory at `path` (e.g. strategies/), imports its
+    modules through the regular import system and returns the classes
+    inheriting from StrategyBase. Modules already in sys.modules are not
+    re-executed, and results are cached per directory until a strategy
+    file is added, removed or modified.
     """
+    path = os.path.abspath(path)
+    names = sorted(m.name for m in pkgutil.iter_modules([path])
+                   if not m.ispkg and not m.name.startswith("_"))
+    stamp = tuple((name, os.stat(os.path.join(path, name + ".py")).st_mtime_ns)
+                  for name in names)
+    return list(_discover_strategies(path, stamp))
+
+# st_mtime_ns of each strategy module when it was last (re)imported here
+_MODULE_MTIMES = {}
+
+@lru_cache(maxsize=8)
+def _discover_strategies(path: str, stamp: tuple) -> tuple:
+    # The package is imported by name, so its parent directory must be importable.
+    # Appended rather than prepended, so it cannot shadow other top-level modules.
+    parent, package = os.path.split(path)
+    if parent not in sys.path:
+        sys.path.append(parent)
+
+    # A same-named package imported earlier (or found first on sys.path)
+    # would silently hand us the wrong strategies
+    pkg_paths = getattr(importlib.import_module(package), '__path__', [])
+    if path not in (os.path.abspath(p) for p in pkg_paths):
+        raise ImportError(
+            f"Package '{package}' resolves to {list(pkg_paths)}, "
+            f"not from {path}"
+        )
+
     strategies = []
-    for fname in os.listdir(path):
-        if not fname.endswith(".py") or fname.startswith("_"):
-            continue
-        module_name = fname[:-3]
-        spec = importlib.util.spec_from_file_location(module_name, os.path.join(path, fname))
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
+    for name, mtime in stamp:
+        module_name = f"{package}.{name}"
+        module = importlib.import_module(module_name)
+        # Only a file edited since we last imported it is executed again
+        if _MODULE_MTIMES.setdefault(module_name, mtime) != mtime:
+            module = importlib.reload(module)
+            _MODULE_MTIMES[module_name] = mtime
 
         for obj in vars(module).values():
-            if isinstance(obj, type) and issubclass(obj, StrategyBase) and obj is not StrategyBase:
+            # Abstract intermediate bases are not strategies themselves
+            if isinstance(obj, type) and issubclass(obj, StrategyBase) and not inspect.isabstract(obj):
                 strategies.append(obj)
-    return strategies
+    return tuple(strategies)
+
+def strategy_name(cls: Type[StrategyBase]) -> str:
+    """
+    Strategy key of a class: its NAME attribute if set, otherwise
+    get_name() of a default-constructed instance.
+    """
+    return getattr(cls, 'NAME', None) or cls().get_name()
 
 def instantiate_strategies(strat_classes, param_grid: dict):
     """
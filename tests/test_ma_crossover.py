@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies.ma_crossover import MACrossover
+
+
+def rolling_signals(close: pd.Series, fast: int, slow: int) -> pd.Series:
+    # The original rolling().mean() implementation of MACrossover
+    ma_fast = close.rolling(fast).mean()
+    ma_slow = close.rolling(slow).mean()
+    cross_up   = (ma_fast.shift(1) < ma_slow.shift(1)) & (ma_fast >= ma_slow)
+    cross_down = (ma_fast.shift(1) > ma_slow.shift(1)) & (ma_fast <= ma_slow)
+
+    signals = pd.Series(0, index=close.index)
+    signals[cross_up]   =  1
+    signals[cross_down] = -1
+    return signals
+
+
+def assert_same_signals(close: pd.Series, fast: int, slow: int):
+    got = MACrossover(fast, slow).generate_signals(close.to_frame('Close'))
+    expected = rolling_signals(close, fast, slow)
+    np.testing.assert_array_equal(got.to_numpy(), expected.to_numpy())
+
+
+def test_flat_tail_crosses_down():
+    # Equal MAs over the flat tail must compare equal, not drift apart
+    close = pd.Series([1.4, 2.0, 1.9, 1.8, 1.4] + [1.5] * 9)
+    signals = MACrossover(2, 5).generate_signals(close.to_frame('Close'))
+    assert signals.iloc[9] == -1
+    assert_same_signals(close, 2, 5)
+
+
+@pytest.mark.parametrize('fast,slow', [(2, 5), (5, 20), (1, 3), (10, 50)])
+@pytest.mark.parametrize('seed', range(20))
+def test_flat_segment_matches_rolling(seed, fast, slow):
+    rng = np.random.default_rng(seed)
+    close = np.cumsum(rng.normal(size=400)) + 100
+    close[150:250] = close[150]
+    assert_same_signals(pd.Series(close), fast, slow)
+
+
+@pytest.mark.parametrize('fast,slow', [(2, 5), (5, 20), (1, 3), (10, 50)])
+@pytest.mark.parametrize('seed', range(20))
+def test_rounded_prices_match_rolling(seed, fast, slow):
+    rng = np.random.default_rng(seed)
+    close = np.round(np.cumsum(rng.normal(size=400)) + 100, 1)
+    close[rng.integers(0, len(close), 4)] = np.nan
+    assert_same_signals(pd.Series(close), fast, slow)
@@ -0,0 +1,131 @@
+"""
+OHLCV / feature file I/O.
+
+CSVs are read with the multi-threaded pyarrow CSV reader, with the
+price/volume columns declared as float64 up front. Reading falls back to
+pandas when pyarrow is not installed or the file does not parse under
+the declared types (e.g. the multi-row headers written by newer yfinance
+versions). Computed features are stored as zstd-compressed Parquet when
+pyarrow is available, so later runs get typed columns without parsing.
+"""
+
+import csv
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+OHLCV_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+# Extension for files written by write_frame: Parquet needs pyarrow
+FEATURES_EXT = '.parquet' if HAS_PYARROW else '.csv'
+
+def _read_csv_pandas(path: str) -> pd.DataFrame:
+    df = pd.read_csv(path, index_col=0, parse_dates=True)
+    # Header junk rows turn the columns into strings → coerce back to numbers
+    for col in OHLCV_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df
+
+def read_ohlcv_csv(path: str) -> pd.DataFrame:
+    """
+    Reads a CSV whose first column is the timestamp index and returns
+    a DataFrame sorted by a DatetimeIndex, with numeric OHLCV columns.
+    """
+    df = None
+    if HAS_PYARROW:
+        with open(path, newline='') as f:
+            index_col = next(csv.reader(f), [''])[0]
+        column_types = {col: pa.float64() for col in OHLCV_COLUMNS}
+        # Keep the timestamps as text: pyarrow would convert offset-aware
+        # stamps to UTC, while pandas keeps the exchange-local offset
+        column_types[index_col] = pa.string()
+        convert_options = pa_csv.ConvertOptions(column_types=column_types)
+        try:
+            tbl = pa_csv.read_csv(path, convert_options=convert_options)
+        except pa.ArrowInvalid:
+            tbl = None
+        if tbl is not None:
+            df = tbl.to_pandas()
+            df = df.set_index(df.columns[0])
+            df.index = pd.to_datetime(df.index)
+            df.index.name = index_col or None
+
+    if df is None:
+        df = _read_csv_pandas(path)
+    return df.sort_index()
+
+def read_ohlcv(path: str) -> pd.DataFrame:
+    """
+    Reads a .parquet or .csv file (chosen by extension) into a DataFrame
+    sorted by its DatetimeIndex. Parquet keeps the stored dtypes, so no
+    numeric coercion is needed.
+    """
+    if path.lower().endswith('.parquet'):
+        df = pd.read_parquet(path)
+        if df.index.dtype == object:
+            # Mixed-offset stamps stored as text by write_frame
+            df.index = pd.to_datetime(df.index)
+        return df.sort_index()
+    return read_ohlcv_csv(path)
+
+def write_frame(df: pd.DataFrame, path: str):
+    """
+    Writes `df` (with its index) as Parquet or CSV, chosen by extension.
+
+    Intraday files spanning a DST change are read into an object index of
+    stamps with mixed offsets (-05:00/-04:00). Parquet would squash those
+    into the first offset, shifting every later bar by an hour, so such an
+    index is stored as text and parsed back by read_ohlcv, as from a CSV.
+    """
+    if path.lower().endswith('.parquet'):
+        if df.index.dtype == object:
+            df = df.copy(deep=False)
+            df.index = df.index.astype(str)
+        df.to_parquet(path, engine='pyarrow', compression='zstd')
+    else:
+        df.to_csv(path)
+
+def to_soa(df: pd.DataFrame, columns=OHLCV_COLUMNS) -> dict:
+    """
+    Structure-of-arrays view of the OHLCV columns: one C-contiguous
+    float64 array per column, so kernels always get unit-stride access.
+    Columns missing from `df` are skipped.
+    """
+    return {
+        col: np.ascontiguousarray(df[col].to_numpy(dtype=np.float64))
+        for col in columns if col in df.columns
+    }
+
+def write_series_csv(series: pd.Series, path: str, name: str = None):
+    """
+    Writes `series` with its index as a two-column CSV (index, values)
+    using the pyarrow CSV writer, or Series.to_csv without pyarrow.
+
+    The header and index are laid out as Series.to_csv does; the values
+    use pyarrow's own float formatting (e.g. '1' for 1.0, '0.00005' for
+    5e-05), which differs in places from pandas' but reads back to the
+    same floats. NaNs are written as empty fields.
+    """
+    name = name or series.name
+    if not HAS_PYARROW:
+        series.rename(name).to_frame().to_csv(path)
+        return
+
+    tbl = pa.table({
+        # Format the index the way pandas does ('2020-01-01' for daily bars)
+        'index': pa.array(series.index.astype(str)),
+        'values': pa.array(series.to_numpy(), from_pandas=True),
+    })
+    with open(path, 'wb') as f:
+        f.write(f"{series.index.name or ''},{name}\n".encode())
+        pa_csv.write_csv(tbl, f, write_options=pa_csv.WriteOptions(
+            include_header=False, quoting_style='none'
+        ))
@@ -0,0 +1,22 @@
+"""
+Optional Numba support.
+
+Exposes `njit`: the real `numba.njit` when Numba is installed, otherwise
+a no-op decorator so the kernels still run as plain Python.
+"""
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        # Bare usage: @njit
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        # Parametrized usage: @njit(cache=True), @njit('f8[:](f8[:])', ...)
+        def decorator(func):
+            return func
+        return decorator